@@ -1,7 +1,5 @@
 import streamlit as st
 import json
-import pandas as pd
-import altair as alt
 
 # Import additional components
 from tax_engine import compute_total_tax_liability
@@ -14,6 +12,22 @@ def format_value_display(value):
     if value > 0:
         return f"{format_indian_currency(value)}"
     return "Not entered"
+
+# Cached tax computation, keyed on a hashable snapshot of the income details
+@st.cache_data(ttl=None, max_entries=128)
+def _cached_tax(details_tuple, fy_ay, employment_type):
+    return compute_total_tax_liability(dict(details_tuple), fy_ay, employment_type)
+
+# Tips depend on the same inputs as the tax result, so they share its cache key
+@st.cache_data(ttl=None, max_entries=128)
+def _cached_tips(details_tuple, fy_ay, employment_type):
+    tax_result = _cached_tax(details_tuple, fy_ay, employment_type)
+    return get_smart_tips(dict(details_tuple), tax_result, fy_ay, employment_type)
+
+# Drop results computed from earlier inputs so they aren't redrawn as if current
+def _clear_tax_results():
+    for key in ('figures', 'tax_result', 'tips'):
+        st.session_state.pop(key, None)
 
 # Improved layout
 st.set_page_config(
@@ -49,6 +63,7 @@ with st.form(key='personal_info'):
     submit_info = st.form_submit_button(label='Submit Profile')
     
     if submit_info:
+        _clear_tax_results()
         st.session_state.form_submitted = True
         st.session_state.age_group = age_group
         st.session_state.residential_status = residential_status
@@ -67,92 +82,101 @@ if st.session_state.form_submitted:
         st.write(f"**Employment Type:** {st.session_state.employment_type}")
 
     with tab_income:
-        # Initialize default values
-        basic_salary = hra = pf = bonus = rent_paid = employer_nps = 0
-        property_details = ""
-        rent_received = municipal_tax = interest_paid = 0
-        net_profit = expenses = 0
-        presumptive_eligibility = False
-        stcg = ltcg = dividends = interest_income = 0
-        tds_paid = advance_tax_paid = 0
+        with st.form(key='income_form'):
+            # Initialize default values
+            basic_salary = hra = pf = bonus = rent_paid = employer_nps = 0
+            property_details = ""
+            rent_received = municipal_tax = interest_paid = 0
+            net_profit = expenses = 0
+            presumptive_eligibility = False
+            stcg = ltcg = dividends = interest_income = 0
+            tds_paid = advance_tax_paid = 0
         
-        if st.session_state.employment_type == "Salaried":
-            st.subheader("Income Details: Salaried")
-            col1, col2 = st.columns(2)
-            with col1:
-                basic_salary = st.number_input("Basic Salary", min_value=0, value=0, key="basic_salary")
-                pf = st.number_input("Provident Fund Contribution", min_value=0, value=0, key="pf")
-                bonus = st.number_input("Bonus", min_value=0, value=0, key="bonus")
-            with col2:
-                hra = st.number_input("HRA", min_value=0, value=0, key="hra")
-                rent_paid = st.number_input("Rent Paid", min_value=0, value=0, key="rent_paid")
-                employer_nps = st.number_input("Employer NPS Contribution", min_value=0, value=0, key="employer_nps")
+            if st.session_state.employment_type == "Salaried":
+                st.subheader("Income Details: Salaried")
+                col1, col2 = st.columns(2)
+                with col1:
+                    basic_salary = st.number_input("Basic Salary", min_value=0, value=0, key="basic_salary")
+                    pf = st.number_input("Provident Fund Contribution", min_value=0, value=0, key="pf")
+                    bonus = st.number_input("Bonus", min_value=0, value=0, key="bonus")
+                with col2:
+                    hra = st.number_input("HRA", min_value=0, value=0, key="hra")
+                    rent_paid = st.number_input("Rent Paid", min_value=0, value=0, key="rent_paid")
+                    employer_nps = st.number_input("Employer NPS Contribution", min_value=0, value=0, key="employer_nps")
 
-        elif st.session_state.employment_type == "Rental":
-            st.subheader("Income Details: Rental")
-            col1, col2 = st.columns(2)
-            with col1:
-                property_details = st.text_input("Property Details", key="property_details")
-                rent_received = st.number_input("Rent Received", min_value=0, value=0, key="rent_received")
-            with col2:
-                municipal_tax = st.number_input("Municipal Tax Paid", min_value=0, value=0, key="municipal_tax")
-                interest_paid = st.number_input("Interest Paid on Home Loan", min_value=0, value=0, key="interest_paid")
+            elif st.session_state.employment_type == "Rental":
+                st.subheader("Income Details: Rental")
+                col1, col2 = st.columns(2)
+                with col1:
+                    property_details = st.text_input("Property Details", key="property_details")
+                    rent_received = st.number_input("Rent Received", min_value=0, value=0, key="rent_received")
+                with col2:
+                    municipal_tax = st.number_input("Municipal Tax Paid", min_value=0, value=0, key="municipal_tax")
+                    interest_paid = st.number_input("Interest Paid on Home Loan", min_value=0, value=0, key="interest_paid")
 
-        elif st.session_state.employment_type in ["Freelancer", "Business"]:
-            st.subheader("Income Details: Freelance / Business")
-            net_profit = st.number_input("Net Profit", min_value=0, value=0, key="net_profit")
-            expenses = st.number_input("Expenses", min_value=0, value=0, key="expenses")
-            presumptive_eligibility = st.checkbox("Eligible for Presumptive Taxation Scheme", key="presumptive")
+            elif st.session_state.employment_type in ["Freelancer", "Business"]:
+                st.subheader("Income Details: Freelance / Business")
+                net_profit = st.number_input("Net Profit", min_value=0, value=0, key="net_profit")
+                expenses = st.number_input("Expenses", min_value=0, value=0, key="expenses")
+                presumptive_eligibility = st.checkbox("Eligible for Presumptive Taxation Scheme", key="presumptive")
 
-        elif st.session_state.employment_type == "Investor":
-            st.subheader("Income Details: Investor")
-            col1, col2 = st.columns(2)
-            with col1:
-                stcg = st.number_input("Short Term Capital Gains (STCG)", min_value=0, value=0, key="stcg")
-                ltcg = st.number_input("Long Term Capital Gains (LTCG)", min_value=0, value=0, key="ltcg")
-            with col2:
-                dividends = st.number_input("Dividends", min_value=0, value=0, key="dividends")
-                interest_income = st.number_input("Interest Income", min_value=0, value=0, key="interest_income")
+            elif st.session_state.employment_type == "Investor":
+                st.subheader("Income Details: Investor")
+                col1, col2 = st.columns(2)
+                with col1:
+                    stcg = st.number_input("Short Term Capital Gains (STCG)", min_value=0, value=0, key="stcg")
+                    ltcg = st.number_input("Long Term Capital Gains (LTCG)", min_value=0, value=0, key="ltcg")
+                with col2:
+                    dividends = st.number_input("Dividends", min_value=0, value=0, key="dividends")
+                    interest_income = st.number_input("Interest Income", min_value=0, value=0, key="interest_income")
 
-        # Optional inputs
-        with st.expander("Optional Fields"):
-            tds_paid = st.number_input("TDS Paid", min_value=0, value=0, key="tds_paid")
-            advance_tax_paid = st.number_input("Advance Tax Paid", min_value=0, value=0, key="advance_tax_paid")
+            # Optional inputs
+            with st.expander("Optional Fields"):
+                tds_paid = st.number_input("TDS Paid", min_value=0, value=0, key="tds_paid")
+                advance_tax_paid = st.number_input("Advance Tax Paid", min_value=0, value=0, key="advance_tax_paid")
+            
+            submit_income = st.form_submit_button(label='Save Income Details')
             
-        # Store income details in session state
-        st.session_state.income_details = {
-            "basic_salary": basic_salary,
-            "hra": hra,
-            "pf": pf,
-            "bonus": bonus,
-            "rent_paid": rent_paid,
-            "employer_nps": employer_nps,
-            "rent_received": rent_received,
-            "municipal_tax": municipal_tax,
-            "interest_paid": interest_paid,
-            "net_profit": net_profit,
-            "expenses": expenses,
-            "stcg": stcg,
-            "ltcg": ltcg,
-            "dividends": dividends,
-            "interest_income": interest_income,
-            "tds_paid": tds_paid,
-            "advance_tax_paid": advance_tax_paid
-        }
+            # Store income details in session state only when the form is submitted
+            if submit_income:
+                new_details = {
+                    "basic_salary": basic_salary,
+                    "hra": hra,
+                    "pf": pf,
+                    "bonus": bonus,
+                    "rent_paid": rent_paid,
+                    "employer_nps": employer_nps,
+                    "rent_received": rent_received,
+                    "municipal_tax": municipal_tax,
+                    "interest_paid": interest_paid,
+                    "net_profit": net_profit,
+                    "expenses": expenses,
+                    "stcg": stcg,
+                    "ltcg": ltcg,
+                    "dividends": dividends,
+                    "interest_income": interest_income,
+                    "tds_paid": tds_paid,
+                    "advance_tax_paid": advance_tax_paid
+                }
+                # Resubmitting identical details keeps the current tax results instead of clearing them
+                if st.session_state.get('income_details') != new_details:
+                    st.session_state.income_details = new_details
+                    _clear_tax_results()
+                st.success("Income details saved!")
 
     with tab_taxation:
         if 'income_details' in st.session_state:
             if st.button("Calculate Tax", type="primary"):
                 with st.spinner("Calculating tax..."):
                     try:
-                        tax_result = compute_total_tax_liability(
-                            st.session_state.income_details, 
+                        details_tuple = tuple(sorted(st.session_state.income_details.items()))
+                        tax_result = _cached_tax(
+                            details_tuple, 
                             st.session_state.fy_ay, 
                             st.session_state.employment_type
                         )
-                        tips = get_smart_tips(
-                            st.session_state.income_details, 
-                            tax_result, 
+                        tips = _cached_tips(
+                            details_tuple, 
                             st.session_state.fy_ay, 
                             st.session_state.employment_type
                         )
@@ -162,8 +186,8 @@ if st.session_state.form_submitted:
                         
                         st.success("Tax calculation complete!")
                         
-                        # Display results
-                        display_visualizations(
+                        # Display results, keeping the figures so later reruns can reuse them
+                        st.session_state.figures = display_visualizations(
                             st.session_state.income_details, 
                             tax_result, 
                             st.session_state.employment_type, 
@@ -173,13 +197,26 @@ if st.session_state.form_submitted:
                         
                     except Exception as e:
                         st.error(f"Error in tax calculation: {str(e)}")
+            elif 'figures' in st.session_state:
+                # Re-display the last results without rebuilding the figures
+                try:
+                    display_visualizations(
+                        st.session_state.income_details, 
+                        st.session_state.tax_result, 
+                        st.session_state.employment_type, 
+                        st.session_state.fy_ay,
+                        figures=st.session_state.figures
+                    )
+                    display_tips(st.session_state.tips)
+                    
+                except Exception as e:
+                    st.error(f"Error in tax calculation: {str(e)}")
         else:
             st.info("Please enter your income details first.")
 
     with tab_reports:
         if 'tax_result' in st.session_state and 'tips' in st.session_state:
             offer_pdf_download(
-                st.session_state.income_details, 
                 st.session_state.tax_result, 
                 st.session_state.tips, 
                 st.session_state.employment_type, 
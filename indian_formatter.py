@@ -3,6 +3,8 @@ Indian number formatting utilities for TaxBot 2025
 Handles formatting numbers in Indian system (lakhs, crores) with proper commas
 """
 
+from functools import lru_cache
+
 def format_indian_number(amount):
     """
     Format number according to Indian number system
@@ -60,9 +62,11 @@ def format_indian_integer(num):
     
     return result
 
+@lru_cache(maxsize=4096)
 def format_indian_currency(amount):
     """
     Format amount as Indian currency (Rs. X,XX,XXX)
+    Memoized, since the same tax components are formatted for the table, report and charts
     """
     formatted_amount = format_indian_number(amount)
     return f"Rs. {formatted_amount}"
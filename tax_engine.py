@@ -1,11 +1,37 @@
+from bisect import bisect_left
+from types import MappingProxyType
+import numpy as np
 from indian_formatter import format_indian_currency, format_indian_number
 
-def get_tax_slabs(fy_ay):
-    """
-    Returns tax slabs for FY 2025-26 / AY 2026-27
-    """
-    return {
-        "slabs": [
+# Stand-in for the open-ended top slab so the slab arrays stay finite
+_SLAB_CEILING = 1e18
+
+# Per-FY (lowers, uppers, rates) arrays for batch computation, built on first use of each resolved fy_ay
+_SLAB_ARRAYS = {}
+
+# Surcharge applies above each threshold (inclusive upper bounds: 50L, 1Cr, 2Cr, 5Cr)
+_SURCHARGE_THRESHOLDS = (5_000_000, 10_000_000, 20_000_000, 50_000_000)
+_SURCHARGE_RATES = (0.0, 0.10, 0.15, 0.25, 0.37)
+
+# Tax configs per FY, built once at import and shared read-only between callers
+_DEFAULT_FY_AY = "FY 2025-26 / AY 2026-27"
+_CONFIGS = {
+    "FY 2024-25 / AY 2025-26": MappingProxyType({
+        "slabs": (
+            (0, 300000, 0),      # 0-3L: 0%
+            (300000, 700000, 0.05),  # 3-7L: 5%
+            (700000, 1000000, 0.10), # 7-10L: 10%
+            (1000000, 1200000, 0.15), # 10-12L: 15%
+            (1200000, 1500000, 0.20), # 12-15L: 20%
+            (1500000, float('inf'), 0.30) # 15L+: 30%
+        ),
+        "standard_deduction": 75000,
+        "rebate_limit": 700000,   # Up to 7L
+        "rebate_max": 25000,      # Maximum 25K
+        "advance_tax_threshold": 10000
+    }),
+    "FY 2025-26 / AY 2026-27": MappingProxyType({
+        "slabs": (
             (0, 400000, 0),      # 0-4L: 0%
             (400000, 800000, 0.05),  # 4-8L: 5%
             (800000, 1200000, 0.10), # 8-12L: 10%
@@ -13,21 +39,47 @@ def get_tax_slabs(fy_ay):
             (1600000, 2000000, 0.20), # 16-20L: 20%
             (2000000, 2400000, 0.25), # 20-24L: 25%
             (2400000, float('inf'), 0.30) # 24L+: 30%
-        ],
+        ),
         "standard_deduction": 75000,
         "rebate_limit": 1200000,  # Up to 12L
         "rebate_max": 60000,      # Maximum 60K
         "advance_tax_threshold": 10000
-    }
+    }),
+}
+
+def _resolve_fy_ay(fy_ay):
+    """
+    Returns fy_ay if a config exists for it, otherwise the default FY / AY
+    """
+    return fy_ay if fy_ay in _CONFIGS else _DEFAULT_FY_AY
+
+def get_tax_slabs(fy_ay):
+    """
+    Returns tax slabs for the given FY / AY, defaulting to FY 2025-26 / AY 2026-27
+    """
+    return _CONFIGS[_resolve_fy_ay(fy_ay)]
+
+def _get_slab_arrays(fy_ay):
+    """
+    Returns the slabs for fy_ay as (lowers, uppers, rates) NumPy arrays
+    """
+    fy_ay = _resolve_fy_ay(fy_ay)
+    if fy_ay not in _SLAB_ARRAYS:
+        slabs = get_tax_slabs(fy_ay)["slabs"]
+        lowers = np.array([lower for lower, _, _ in slabs], dtype=np.float64)
+        uppers = np.array([min(upper, _SLAB_CEILING) for _, upper, _ in slabs], dtype=np.float64)
+        rates = np.array([rate for _, _, rate in slabs], dtype=np.float64)
+        _SLAB_ARRAYS[fy_ay] = (lowers, uppers, rates)
+    return _SLAB_ARRAYS[fy_ay]
 
 def calculate_income_tax(taxable_income, fy_ay, age_group="Below 60"):
     if not isinstance(taxable_income, (int, float)) or taxable_income < 0:
         raise ValueError("Taxable income must be a non-negative number")
-    config = get_tax_slabs(fy_ay)
-    slabs = config["slabs"]
-    tax = 0
+    # A plain loop over the (at most 7) slab tuples; NumPy/Numba overhead outweighs the arithmetic here
+    slabs = get_tax_slabs(fy_ay)["slabs"]
+    tax = 0.0
     tax_breakdown = []
-    for i, (lower, upper, rate) in enumerate(slabs):
+    for lower, upper, rate in slabs:
         if taxable_income <= lower:
             break
         taxable_in_slab = min(taxable_income, upper) - lower
@@ -49,16 +101,8 @@ def calculate_rebate_87a(gross_tax, taxable_income, fy_ay):
     return 0
 
 def calculate_cess_and_surcharge(tax_after_rebate, taxable_income):
-    surcharge = 0
-    if taxable_income > 5000000:
-        if taxable_income <= 10000000:
-            surcharge = tax_after_rebate * 0.10
-        elif taxable_income <= 20000000:
-            surcharge = tax_after_rebate * 0.15
-        elif taxable_income <= 50000000:
-            surcharge = tax_after_rebate * 0.25
-        else:
-            surcharge = tax_after_rebate * 0.37
+    rate = _SURCHARGE_RATES[bisect_left(_SURCHARGE_THRESHOLDS, taxable_income)]
+    surcharge = tax_after_rebate * rate
     cess = (tax_after_rebate + surcharge) * 0.04
     return surcharge, cess
 
@@ -71,29 +115,66 @@ def calculate_capital_gains_tax(stcg, ltcg):
     # LTCG: 12.5% on gains > ₹1.25L (equity), 20% with indexation (other assets)
     
     stcg_tax = stcg * 0.20  # Updated rate for 2025-26
-    ltcg_tax = max(0, (ltcg - 125000)) * 0.125  # Updated exemption limit and rate for 2025-26
+    ltcg_tax = (ltcg - 125000 if ltcg > 125000 else 0) * 0.125  # Updated exemption limit and rate for 2025-26
     
     return stcg_tax, ltcg_tax
 
+def compute_total_tax_liability_batch(taxable_incomes, fy_ay):
+    """
+    Compute total tax liability (slab tax after 87A rebate, plus surcharge and cess)
+    for an array of taxable incomes at once, e.g. for what-if scenario comparisons
+    """
+    incomes = np.atleast_1d(np.asarray(taxable_incomes, dtype=np.float64))
+    if incomes.ndim != 1:
+        raise ValueError("Taxable incomes must be a scalar or a 1-D sequence")
+    if np.any(incomes < 0):
+        raise ValueError("Taxable income must be a non-negative number")
+    config = get_tax_slabs(fy_ay)
+    lowers, uppers, rates = _get_slab_arrays(fy_ay)
+    per_slab = np.clip(incomes[:, None] - lowers[None, :], 0.0, (uppers - lowers)[None, :]) * rates[None, :]
+    gross_taxes = per_slab.sum(axis=1)
+    rebates = np.where(incomes <= config["rebate_limit"], np.minimum(gross_taxes, config["rebate_max"]), 0.0)
+    taxes_after_rebate = gross_taxes - rebates
+    surcharge_rates = np.asarray(_SURCHARGE_RATES)[np.searchsorted(_SURCHARGE_THRESHOLDS, incomes, side="left")]
+    surcharges = taxes_after_rebate * surcharge_rates
+    cess = (taxes_after_rebate + surcharges) * 0.04
+    return taxes_after_rebate + surcharges + cess
+
 def compute_total_tax_liability(income_details, fy_ay, employment_type):
+    config = get_tax_slabs(fy_ay)
     taxable_income = 0
     if employment_type == "Salaried":
         gross_salary = income_details.get('basic_salary', 0) + \
                        income_details.get('hra', 0) + \
                        income_details.get('bonus', 0)
-        config = get_tax_slabs(fy_ay)
-        taxable_income = max(0, gross_salary - config["standard_deduction"])
+        standard_deduction = config["standard_deduction"]
+        taxable_income = gross_salary - standard_deduction if gross_salary > standard_deduction else 0
     elif employment_type == "Rental":
         rental_income = income_details.get('rent_received', 0) - \
                         income_details.get('municipal_tax', 0) - \
                         income_details.get('interest_paid', 0)
-        taxable_income = max(0, rental_income)
+        taxable_income = rental_income if rental_income > 0 else 0
     elif employment_type in ["Freelancer", "Business"]:
         taxable_income = income_details.get('net_profit', 0)
     elif employment_type == "Investor":
         other_income = income_details.get('dividends', 0) + \
                        income_details.get('interest_income', 0)
         taxable_income = other_income
+    # Nothing to tax (e.g. a form submitted with all zeros): skip the slab/rebate/surcharge work
+    if taxable_income == 0 and income_details.get('stcg', 0) == 0 and income_details.get('ltcg', 0) == 0:
+        return {
+            "taxable_income": taxable_income,
+            "gross_tax": 0.0,
+            "rebate_87a": 0.0,
+            "tax_after_rebate": 0.0,
+            "surcharge": 0.0,
+            "cess": 0.0,
+            "stcg_tax": 0.0,
+            "ltcg_tax": 0.0,
+            "total_tax": 0.0,
+            "advance_tax_required": False,
+            "tax_breakdown": []
+        }
     gross_tax, tax_breakdown = calculate_income_tax(taxable_income, fy_ay)
     rebate_87a = calculate_rebate_87a(gross_tax, taxable_income, fy_ay)
     tax_after_rebate = gross_tax - rebate_87a
@@ -103,7 +184,7 @@ def compute_total_tax_liability(income_details, fy_ay, employment_type):
         income_details.get('ltcg', 0)
     )
     total_tax = tax_after_rebate + surcharge + cess + stcg_tax + ltcg_tax
-    advance_tax_required = total_tax > get_tax_slabs(fy_ay)["advance_tax_threshold"]
+    advance_tax_required = total_tax > config["advance_tax_threshold"]
     return {
         "taxable_income": taxable_income,
         "gross_tax": gross_tax,
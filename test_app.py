@@ -60,6 +60,33 @@ def test_tax_engine():
         traceback.print_exc()
         return False
 
+def test_batch_tax():
+    """Test that batch tax computation matches the scalar engine"""
+    try:
+        from tax_engine import compute_total_tax_liability, compute_total_tax_liability_batch
+        
+        fy_ay = "FY 2025-26 / AY 2026-27"
+        incomes = [0, 700000, 1200000, 1500000, 5000000, 7500000, 60000000]
+        
+        batch_taxes = compute_total_tax_liability_batch(incomes, fy_ay)
+        assert len(batch_taxes) == len(incomes)
+        
+        for income, batch_tax in zip(incomes, batch_taxes):
+            result = compute_total_tax_liability({"net_profit": income}, fy_ay, "Business")
+            assert abs(result["total_tax"] - batch_tax) < 1e-6
+        
+        # A scalar income is treated as a batch of one
+        scalar_taxes = compute_total_tax_liability_batch(5000000, fy_ay)
+        assert scalar_taxes.shape == (1,)
+        assert abs(scalar_taxes[0] - batch_taxes[incomes.index(5000000)]) < 1e-6
+        
+        print("✅ Batch tax tests passed")
+        return True
+    except Exception as e:
+        print(f" Batch tax error: {e}")
+        traceback.print_exc()
+        return False
+
 def test_smart_tips():
     """Test the smart tips module"""
     try:
@@ -133,6 +160,7 @@ def run_all_tests():
     tests = [
         ("Import Tests", test_imports),
         ("Tax Engine Tests", test_tax_engine),
+        ("Batch Tax Tests", test_batch_tax),
         ("Smart Tips Tests", test_smart_tips),
         ("Visualization Tests", test_visualization)
     ]
@@ -4,37 +4,48 @@ Provides interactive charts and comprehensive PDF export functionality
 """
 
 import streamlit as st
-import pandas as pd
-import altair as alt
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-import plotly.express as px
 import numpy as np
 import io
+import html
 from datetime import datetime
 from indian_formatter import format_indian_currency, format_indian_number
 from tax_engine import get_tax_slabs
 
+# Pie chart labels and the tax_result keys they are read from
+_PIE_LABELS = ("Income Tax", "Surcharge", "Health & Education Cess", "STCG Tax", "LTCG Tax")
+_PIE_KEYS = ("tax_after_rebate", "surcharge", "cess", "stcg_tax", "ltcg_tax")
+
+# (label, income_details key) pairs charted for each employment type
+_INCOME_SOURCES = {
+    "Salaried": (("Basic Salary", "basic_salary"), ("HRA", "hra"), ("Bonus", "bonus")),
+    "Rental": (("Rent Received", "rent_received"),),
+    "Freelancer": (("Net Profit", "net_profit"),),
+    "Business": (("Net Profit", "net_profit"),),
+    "Investor": (
+        ("Dividends", "dividends"), ("Interest Income", "interest_income"),
+        ("STCG", "stcg"), ("LTCG", "ltcg")
+    ),
+}
+
 def create_tax_breakdown_chart(tax_result):
     """
     Create an enhanced and interactive pie chart showing tax breakdown
     """
-    components = [
-        "Income Tax", "Surcharge", "Health  Education Cess", "STCG Tax", "LTCG Tax"
-    ]
-    values = [
-        tax_result["tax_after_rebate"],
-        tax_result["surcharge"],
-        tax_result["cess"],
-        tax_result["stcg_tax"],
-        tax_result["ltcg_tax"]
-    ]
-    
+    fig = _cached_tax_breakdown_chart(tuple(tax_result[k] for k in _PIE_KEYS))
+    if fig is None:
+        st.success("🎉 Congratulations! No tax liability due to Section 87A rebate or zero taxable income.")
+    return fig
+
+@st.cache_data(max_entries=128)
+def _cached_tax_breakdown_chart(values):
+    """
+    Build the tax breakdown pie chart, memoized on the component values
+    """
+    import plotly.express as px
     # Filter zero values for a clean chart
-    non_zero_components = [(c, v) for c, v in zip(components, values) if v > 0]
+    non_zero_components = [(c, v) for c, v in zip(_PIE_LABELS, values) if v > 0]
     
     if not non_zero_components:
-        st.success("🎉 Congratulations! No tax liability due to Section 87A rebate or zero taxable income.")
         return None
     
     components, values = zip(*non_zero_components)
@@ -64,6 +75,7 @@ def create_tax_efficiency_gauge(tax_result):
     """
     Create a gauge chart showing tax efficiency
     """
+    import plotly.graph_objects as go
     taxable_income = tax_result['taxable_income']
     total_tax = tax_result['total_tax']
     
@@ -106,6 +118,7 @@ def create_tax_vs_income_comparison(tax_result):
     """
     Create a comparison chart between gross income and tax liability
     """
+    import plotly.graph_objects as go
     taxable_income = tax_result['taxable_income']
     total_tax = tax_result['total_tax']
     net_income = taxable_income - total_tax
@@ -139,6 +152,8 @@ def create_tax_slab_progression_chart(tax_result):
     """
     Create a progressive tax slab visualization
     """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
     if not tax_result["tax_breakdown"]:
         return None
     
@@ -200,6 +215,7 @@ def create_savings_potential_chart(tax_result):
     """
     Create a chart showing potential savings opportunities
     """
+    import plotly.graph_objects as go
     taxable_income = tax_result['taxable_income']
     current_tax = tax_result['total_tax']
     
@@ -239,53 +255,30 @@ def create_income_composition_chart(income_details, employment_type):
     """
     Create a bar chart showing income composition
     """
-    income_sources = []
-    amounts = []
+    fig = _cached_income_composition_chart(tuple(sorted(income_details.items())), employment_type)
+    if fig is None:
+        st.info("No income data to display.")
+    return fig
+
+@st.cache_data(max_entries=128)
+def _cached_income_composition_chart(details_tuple, employment_type):
+    """
+    Build the income composition chart, memoized on the income details
+    """
+    import plotly.graph_objects as go
+    income_details = dict(details_tuple)
     
-    if employment_type == "Salaried":
-        if income_details.get('basic_salary', 0) > 0:
-            income_sources.append("Basic Salary")
-            amounts.append(income_details['basic_salary'])
-        
-        if income_details.get('hra', 0) > 0:
-            income_sources.append("HRA")
-            amounts.append(income_details['hra'])
-        
-        if income_details.get('bonus', 0) > 0:
-            income_sources.append("Bonus")
-            amounts.append(income_details['bonus'])
-    
-    elif employment_type == "Rental":
-        if income_details.get('rent_received', 0) > 0:
-            income_sources.append("Rent Received")
-            amounts.append(income_details['rent_received'])
-    
-    elif employment_type in ["Freelancer", "Business"]:
-        if income_details.get('net_profit', 0) > 0:
-            income_sources.append("Net Profit")
-            amounts.append(income_details['net_profit'])
-    
-    elif employment_type == "Investor":
-        if income_details.get('dividends', 0) > 0:
-            income_sources.append("Dividends")
-            amounts.append(income_details['dividends'])
-        
-        if income_details.get('interest_income', 0) > 0:
-            income_sources.append("Interest Income")
-            amounts.append(income_details['interest_income'])
-        
-        if income_details.get('stcg', 0) > 0:
-            income_sources.append("STCG")
-            amounts.append(income_details['stcg'])
-        
-        if income_details.get('ltcg', 0) > 0:
-            income_sources.append("LTCG")
-            amounts.append(income_details['ltcg'])
+    non_zero_sources = [
+        (label, income_details.get(key, 0))
+        for label, key in _INCOME_SOURCES.get(employment_type, ())
+        if income_details.get(key, 0) > 0
+    ]
     
-    if not income_sources:
-        st.info("No income data to display.")
+    if not non_zero_sources:
         return None
     
+    income_sources, amounts = zip(*non_zero_sources)
+    
     fig = go.Figure(data=[go.Bar(
         x=income_sources,
         y=amounts,
@@ -307,8 +300,23 @@ def create_tax_slab_visualization(tax_result, fy_ay):
     """
     Create a visualization showing tax slab utilization
     """
-    if not tax_result["tax_breakdown"]:
+    breakdown_tuple = tuple(
+        (b["slab"], b["rate"], b["taxable_amount"], b["tax"])
+        for b in tax_result["tax_breakdown"]
+    )
+    fig = _cached_tax_slab_visualization(breakdown_tuple, fy_ay)
+    if fig is None:
         st.info("No tax slab data to display.")
+    return fig
+
+@st.cache_data(max_entries=128)
+def _cached_tax_slab_visualization(breakdown_tuple, fy_ay):
+    """
+    Build the tax slab utilization chart, memoized on the slab breakdown
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    if not breakdown_tuple:
         return None
     
     slabs = []
@@ -316,11 +324,11 @@ def create_tax_slab_visualization(tax_result, fy_ay):
     amounts = []
     taxes = []
     
-    for breakdown in tax_result["tax_breakdown"]:
-        slabs.append(breakdown["slab"])
-        rates.append(breakdown["rate"])
-        amounts.append(breakdown["taxable_amount"])
-        taxes.append(breakdown["tax"])
+    for slab, rate, taxable_amount, tax in breakdown_tuple:
+        slabs.append(slab)
+        rates.append(rate)
+        amounts.append(taxable_amount)
+        taxes.append(tax)
     
     # Create subplots
     fig = make_subplots(
@@ -393,78 +401,108 @@ def display_tax_summary_table(tax_result):
         ]
     }
     
-    df = pd.DataFrame(summary_data)
-    st.table(df)
+    st.table([
+        {"Component": c, "Amount": a}
+        for c, a in zip(summary_data["Component"], summary_data["Amount"])
+    ])
+
+# Stands in for the generation time in cached reports; filled in when the report is served
+_GENERATED_ON_PLACEHOLDER = "{generated_on}"
+
+# Report layout; placeholders are filled with formatted tax amounts via str.format_map
+_HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>TaxBot 2025 - Tax Report</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; margin: 20px; }}
+        .header {{ background-color: #f0f0f0; padding: 20px; text-align: center; }}
+        .section {{ margin: 20px 0; }}
+        .summary-table {{ width: 100%; border-collapse: collapse; }}
+        .summary-table th, .summary-table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        .summary-table th {{ background-color: #f2f2f2; }}
+        .tip {{ background-color: #f9f9f9; padding: 10px; margin: 10px 0; border-left: 4px solid #007bff; }}
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>TaxBot 2025 - Tax Calculation Report</h1>
+        <p>Generated on: {generated_on}</p>
+        <p>Financial Year: {fy_ay}</p>
+        <p>Employment Type: {employment_type}</p>
+    </div>
+    
+    <div class="section">
+        <h2>Tax Calculation Summary</h2>
+        <table class="summary-table">
+            <tr><th>Component</th><th>Amount</th></tr>
+            <tr><td>Taxable Income</td><td>{taxable_income}</td></tr>
+            <tr><td>Gross Tax</td><td>{gross_tax}</td></tr>
+            <tr><td>Section 87A Rebate</td><td>{rebate_87a}</td></tr>
+            <tr><td>Tax after Rebate</td><td>{tax_after_rebate}</td></tr>
+            <tr><td>Surcharge</td><td>{surcharge}</td></tr>
+            <tr><td>Health & Education Cess</td><td>{cess}</td></tr>
+            <tr><td>STCG Tax</td><td>{stcg_tax}</td></tr>
+            <tr><td>LTCG Tax</td><td>{ltcg_tax}</td></tr>
+            <tr><td><strong>Total Tax Liability</strong></td><td><strong>{total_tax}</strong></td></tr>
+        </table>
+    </div>
+    
+    <div class="section">
+        <h2>Smart Tax Tips</h2>
+        {tips_html}
+    </div>
+    
+    <div class="section">
+        <h2>Disclaimer</h2>
+        <p>This report is generated by TaxBot 2025 for informational purposes only. Please consult with a tax professional for official tax filing and advice.</p>
+    </div>
+</body>
+</html>
+"""
+
+@st.cache_data(max_entries=128)
+def _cached_report(result_t, tips_t, employment_type, fy_ay):
+    """
+    Render the report HTML from hashable snapshots of its inputs, memoized across reruns
+    The generation time is left as a placeholder, and failures raise so they aren't cached
+    """
+    # Render all tips in one pass; tip text is escaped since it may echo user input
+    tips_html = ''.join(
+        f'<div class="tip"><strong>{html.escape(icon)} {html.escape(title)}</strong>'
+        f'<p>{html.escape(description)}</p></div>'
+        for icon, title, description in tips_t
+    )
+    
+    # Format every numeric tax field once and fill the template in a single pass
+    fields = {
+        k: format_indian_currency(v)
+        for k, v in result_t
+        if isinstance(v, (int, float)) and not isinstance(v, bool)
+    }
+    fields.update(
+        generated_on=_GENERATED_ON_PLACEHOLDER,
+        fy_ay=fy_ay,
+        employment_type=employment_type,
+        tips_html=tips_html
+    )
+    return _HTML_TEMPLATE.format_map(fields)
 
-def generate_pdf_report(income_details, tax_result, tips, employment_type, fy_ay):
+def generate_pdf_report(tax_result, tips, employment_type, fy_ay, generated_at=None):
     """
     Generate PDF report (simplified version using HTML)
+    The report body is cached; generated_at (default: now) is stamped in on every call
     """
+    generated_at = generated_at or datetime.now()
     try:
-        # Create HTML content for the report
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>TaxBot 2025 - Tax Report</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .header {{ background-color: #f0f0f0; padding: 20px; text-align: center; }}
-                .section {{ margin: 20px 0; }}
-                .summary-table {{ width: 100%; border-collapse: collapse; }}
-                .summary-table th, .summary-table td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                .summary-table th {{ background-color: #f2f2f2; }}
-                .tip {{ background-color: #f9f9f9; padding: 10px; margin: 10px 0; border-left: 4px solid #007bff; }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>TaxBot 2025 - Tax Calculation Report</h1>
-                <p>Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                <p>Financial Year: {fy_ay}</p>
-                <p>Employment Type: {employment_type}</p>
-            </div>
-            
-            <div class="section">
-                <h2>Tax Calculation Summary</h2>
-                <table class="summary-table">
-                    <tr><th>Component</th><th>Amount</th></tr>
-                    <tr><td>Taxable Income</td><td>{format_indian_currency(tax_result['taxable_income'])}</td></tr>
-                    <tr><td>Gross Tax</td><td>{format_indian_currency(tax_result['gross_tax'])}</td></tr>
-                    <tr><td>Section 87A Rebate</td><td>{format_indian_currency(tax_result['rebate_87a'])}</td></tr>
-                    <tr><td>Tax after Rebate</td><td>{format_indian_currency(tax_result['tax_after_rebate'])}</td></tr>
-                    <tr><td>Surcharge</td><td>{format_indian_currency(tax_result['surcharge'])}</td></tr>
-                    <tr><td>Health & Education Cess</td><td>{format_indian_currency(tax_result['cess'])}</td></tr>
-                    <tr><td>STCG Tax</td><td>{format_indian_currency(tax_result['stcg_tax'])}</td></tr>
-                    <tr><td>LTCG Tax</td><td>{format_indian_currency(tax_result['ltcg_tax'])}</td></tr>
-                    <tr><td><strong>Total Tax Liability</strong></td><td><strong>{format_indian_currency(tax_result['total_tax'])}</strong></td></tr>
-                </table>
-            </div>
-            
-            <div class="section">
-                <h2>Smart Tax Tips</h2>
-        """
-        
-        for tip in tips:
-            html_content += f"""
-                <div class="tip">
-                    <strong>{tip['icon']} {tip['title']}</strong>
-                    <p>{tip['description']}</p>
-                </div>
-            """
-        
-        html_content += """
-            </div>
-            
-            <div class="section">
-                <h2>Disclaimer</h2>
-                <p>This report is generated by TaxBot 2025 for informational purposes only. Please consult with a tax professional for official tax filing and advice.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        return html_content
+        html_content = _cached_report(
+            tuple(sorted((k, v) for k, v in tax_result.items() if k != "tax_breakdown")),
+            tuple((tip["icon"], tip["title"], tip["description"]) for tip in tips),
+            employment_type,
+            fy_ay
+        )
+        return html_content.replace(_GENERATED_ON_PLACEHOLDER, generated_at.strftime('%Y-%m-%d %H:%M:%S'), 1)
     
     except Exception as e:
         st.error(f"Error generating PDF report: {str(e)}")
@@ -508,10 +546,23 @@ def display_key_metrics(tax_result):
             delta="Due in quarterly installments" if tax_result['advance_tax_required'] else "Annual filing sufficient"
         )
 
-def display_visualizations(income_details, tax_result, employment_type, fy_ay):
+def _show_chart(figures, key, build_chart):
+    """
+    Display figures[key], building it with build_chart() only if it isn't there yet
+    Missing charts are rebuilt each time so the builder can show its empty-data message again
+    """
+    if figures.get(key) is None:
+        figures[key] = build_chart()
+    if figures[key]:
+        st.plotly_chart(figures[key], use_container_width=True)
+
+def display_visualizations(income_details, tax_result, employment_type, fy_ay, figures=None):
     """
     Display enhanced visualizations for tax insights
+    Returns the figures shown, which can be passed back in to re-display them without rebuilding
     """
+    figures = {} if figures is None else figures
+    
     st.subheader("📈 Comprehensive Tax Visualizations")
     
     # Display key metrics first
@@ -533,50 +584,41 @@ def display_visualizations(income_details, tax_result, employment_type, fy_ay):
             st.metric("Your Tax Savings", f"Rs. {tax_result['rebate_87a']:,.0f}", "Thanks to Section 87A rebate")
         with col2:
             st.metric("Net Take-home", f"Rs. {tax_result['taxable_income']:,.0f}", "100% of taxable income")
-        return
+        return figures
     
     # Create a three-column layout
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        tax_chart = create_tax_breakdown_chart(tax_result)
-        if tax_chart:
-            st.plotly_chart(tax_chart, use_container_width=True)
-        efficiency_gauge = create_tax_efficiency_gauge(tax_result)
-        if efficiency_gauge:
-            st.plotly_chart(efficiency_gauge, use_container_width=True)
+        _show_chart(figures, 'tax', lambda: create_tax_breakdown_chart(tax_result))
+        _show_chart(figures, 'efficiency', lambda: create_tax_efficiency_gauge(tax_result))
     
     with col2:
-        income_chart = create_income_composition_chart(income_details, employment_type)
-        if income_chart:
-            st.plotly_chart(income_chart, use_container_width=True)
-        tax_vs_income = create_tax_vs_income_comparison(tax_result)
-        if tax_vs_income:
-            st.plotly_chart(tax_vs_income, use_container_width=True)
+        _show_chart(figures, 'income', lambda: create_income_composition_chart(income_details, employment_type))
+        _show_chart(figures, 'tax_vs_income', lambda: create_tax_vs_income_comparison(tax_result))
     
     with col3:
-        savings_potential_chart = create_savings_potential_chart(tax_result)
-        if savings_potential_chart:
-            st.plotly_chart(savings_potential_chart, use_container_width=True)
-        slab_progression_chart = create_tax_slab_progression_chart(tax_result)
-        if slab_progression_chart:
-            st.plotly_chart(slab_progression_chart, use_container_width=True)
+        _show_chart(figures, 'savings', lambda: create_savings_potential_chart(tax_result))
+        _show_chart(figures, 'slab', lambda: create_tax_slab_progression_chart(tax_result))
+    
+    return figures
 
-def offer_pdf_download(income_details, tax_result, tips, employment_type, fy_ay):
+def offer_pdf_download(tax_result, tips, employment_type, fy_ay):
     """
     Offer PDF download functionality
     """
     st.subheader("📄 Download Report")
     
     if st.button("Generate PDF Report"):
-        html_content = generate_pdf_report(income_details, tax_result, tips, employment_type, fy_ay)
+        generated_at = datetime.now()
+        html_content = generate_pdf_report(tax_result, tips, employment_type, fy_ay, generated_at)
         
         if html_content:
             # Convert HTML to downloadable format
             st.download_button(
                 label="Download Tax Report (HTML)",
                 data=html_content,
-                file_name=f"taxbot_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html",
+                file_name=f"taxbot_report_{generated_at.strftime('%Y%m%d_%H%M%S')}.html",
                 mime="text/html"
             )
             